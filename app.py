@@ -1,41 +1,187 @@
-import validators
 import streamlit as st
 from langchain.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from langchain.chains.summarize import load_summarize_chain
-from langchain_community.document_loaders import YoutubeLoader, UnstructuredURLLoader
+from langchain.chains import LLMChain
+from langchain.schema import Document
+from requests.adapters import HTTPAdapter
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+import functools
+import hashlib
 import logging
+import re
+import uuid
+from logging.handlers import RotatingFileHandler
+import requests
+from urllib.parse import urlparse
+
+
+_LOG_FILE = "app.log"
+_logger = logging.getLogger("summarizer")
+
+# Streamlit re-executes this module on every rerun; only attach the handler once
+if not _logger.handlers:
+    _log_handler = RotatingFileHandler(_LOG_FILE, maxBytes=1_000_000, backupCount=3, encoding="utf-8")
+    _log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _logger.addHandler(_log_handler)
+    _logger.setLevel(logging.INFO)
+
+
+def _log_failure(message: str, *args) -> str:
+    """Log the current exception under a fresh error ID and return the ID
+
+    The ID is shown to the user so a report can be matched to its traceback
+    without exposing the log itself.
+    """
+    error_id = uuid.uuid4().hex[:8]
+    _logger.exception("[%s] " + message, error_id, *args)
+    return error_id
+
+
+_YT_HOSTS = frozenset({
+    "youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com",
+    "youtu.be", "youtube-nocookie.com", "www.youtube-nocookie.com"
+})
+_YT_DOMAIN_SUFFIXES = (".youtube.com", ".youtube-nocookie.com")
+_MAX_CONCURRENT_MAP_CALLS = 8
+_VIDEO_ID_RE = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([A-Za-z0-9_-]{11})")
+
+
+@st.cache_resource
+def _get_http_adapter() -> HTTPAdapter:
+    """Return the process-wide connection pool, kept alive across reruns
+
+    Only the pool is shared; each fetch gets its own session so cookies
+    never leak between users.
+    """
+    return HTTPAdapter(pool_connections=8, pool_maxsize=8)
+
+
+def _new_session() -> requests.Session:
+    """Create a session that reuses the shared connection pool
+
+    Do not close it: Session.close() would also close the shared adapter.
+    """
+    adapter = _get_http_adapter()
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Heavy dependencies are imported on first use to keep Streamlit cold-start fast
+
+@functools.lru_cache(1)
+def _youtube_loader_cls():
+    """Import and return YoutubeLoader"""
+    from langchain_community.document_loaders import YoutubeLoader
+    return YoutubeLoader
+
+
+@functools.lru_cache(1)
+def _partition_html():
+    """Import and return unstructured's HTML partitioner"""
+    from unstructured.partition.html import partition_html
+    return partition_html
+
+
+@functools.lru_cache(1)
+def _chat_groq_cls():
+    """Import and return ChatGroq"""
+    from langchain_groq import ChatGroq
+    return ChatGroq
+
+
+@functools.lru_cache(1)
+def _validators():
+    """Import and return the validators module"""
+    import validators
+    return validators
+
+
+def _url_host(url: str) -> str:
+    """Return the lower-cased host of the URL without port or userinfo"""
+    return urlparse(url).hostname or ""
+
+
+def _estimate_tokens(text: str) -> int:
+    """Conservatively estimate the token count of text at about four UTF-8 bytes per token
+
+    Counting bytes rather than characters keeps the estimate safe for
+    non-Latin scripts (Hindi, CJK), which use far fewer characters per token.
+    ChatGroq inherits the default get_num_tokens, which loads the GPT-2
+    tokenizer from transformers and downloads it on first use.
+    """
+    return len(text.encode("utf-8")) // 4
+
+
+def _extract_video_id(url: str) -> Optional[str]:
+    """Extract the 11 character video ID from a YouTube URL"""
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+@st.cache_data(ttl=86400, max_entries=256, show_spinner=False)
+def _load_yt(video_id: str) -> list[dict]:
+    """Load a YouTube transcript, cached by video ID so URL variants share an entry"""
+    loader = _youtube_loader_cls().from_youtube_url(f"https://youtu.be/{video_id}", add_video_info = False)
+    return [
+        {"page_content": doc.page_content, "metadata": doc.metadata}
+        for doc in loader.load()
+    ]
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _load_page(url: str, _headers: dict) -> list[dict]:
+    """Fetch and partition a web page, cached by URL so repeat requests skip the fetch"""
+    response = _new_session().get(
+        url,
+        headers = _headers,
+        verify = False,
+        timeout = 30
+    )
+    response.raise_for_status()
+
+    content_type = response.headers.get("Content-Type", "")
+    if not content_type.startswith("text/html"):
+        raise ValueError(f"Expected content type text/html. Got {content_type}.")
+
+    partition_html = _partition_html()
+    elements = partition_html(text=response.text)
+    text = "\n\n".join(str(element) for element in elements)
+    return [{"page_content": text, "metadata": {"source": url}}]
 
 
 class DocumentLoader(ABC):
     """Abstract base class for document loaders"""
 
+    __slots__ = ()
+
     @abstractmethod
     def load_documents(self, url: str) -> List:
         """Load documents from the given url"""
         pass
 
-    @abstractmethod
-    def is_valid_url(self, url: str) -> bool:
-        """Check if the URL is valid for this loader"""
-        pass
-
 class YouTubeDocumentLoader(DocumentLoader):
     """Concrete implementation for loading YouTube videos"""
 
+    __slots__ = ()
+
     def load_documents(self, url: str) -> List:
         """Load documents from YouTube URL"""
-        loader = YoutubeLoader.from_youtube_url(url, add_video_info = True)
+        video_id = _extract_video_id(url)
+        if video_id:
+            return [Document(**doc) for doc in _load_yt(video_id)]
+
+        loader = _youtube_loader_cls().from_youtube_url(url, add_video_info = False)
         return loader.load()
     
-    def is_valid_url(self, url: str) -> bool:
-        """Check if URL is a YouTube URL"""
-        return "youtube.com" in url or "youtu.be" in url
-    
 class WebsiteDocumentLoader(DocumentLoader):
     """Concrete implementation for loading website content"""
+
+    __slots__ = ("headers",)
+
     def __init__(self):
        self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_5_1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36"
@@ -43,70 +189,123 @@ class WebsiteDocumentLoader(DocumentLoader):
        
     def load_documents(self, url: str) -> List:
         """Load documents from website URL"""
-        loader = UnstructuredURLLoader(
-            urls=[url],
-            ssl_verify = False,
-            headers = self.headers
-        )
-        return loader.load()
-    
-    def is_valid_url(self, url: str) -> bool:
-        """Check if URL is a valid website URL"""
-        return validators.url(url) and "youtube.com" not in url and "youtu.be" not in url 
+        return [Document(**doc) for doc in _load_page(url, self.headers)]
     
 
 class DocumentLoaderFactory:
     """Factory class to create appropriate document loaders"""
 
+    __slots__ = ("_youtube", "_web", "_host_table")
+
     def __init__(self):
-        self.loaders = [
-            YouTubeDocumentLoader(),
-            WebsiteDocumentLoader()
-        ]
+        self._youtube = YouTubeDocumentLoader()
+        self._web = WebsiteDocumentLoader()
+        self._host_table = {host: self._youtube for host in _YT_HOSTS}
     
-    def get_loader(self, url: str) -> Optional[DocumentLoader]:
+    def get_loader(self, url: str) -> DocumentLoader:
         """Get the appropriate loader for the given url"""
-        for loader in self.loaders:
-            if loader.is_valid_url(url):
-                return loader
-            
-        return None
-    
+        host = _url_host(url)
+        loader = self._host_table.get(host)
+        if loader is None:
+            # Less common YouTube subdomains are not in the table
+            loader = self._youtube if host.endswith(_YT_DOMAIN_SUFFIXES) else self._web
+        return loader
+
+
+@st.cache_resource
+def get_factory() -> DocumentLoaderFactory:
+    """Return the process-wide loader factory; loaders are stateless"""
+    return DocumentLoaderFactory()
+
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def _build_map_chain(model_name: str, api_key_hash: str, map_prompt_template: str,
+                     _groq_api_key: str) -> LLMChain:
+    """Build the LLM and the map-step chain, reused across Streamlit reruns.
+
+    The final summary is streamed straight from the chain's LLM, so no
+    combine chain is built.
+
+    The raw API key is excluded from the cache key (leading underscore);
+    its SHA-256 digest is used instead so it never shows up in the cache.
+    Entries expire so clients holding a key are not kept for the server's lifetime.
+    """
+    ChatGroq = _chat_groq_cls()
+    llm = ChatGroq(
+        model = model_name,
+        groq_api_key = _groq_api_key,
+        streaming = True
+    )
+    return LLMChain(
+        llm = llm,
+        prompt = PromptTemplate(
+            template=map_prompt_template,
+            input_variables=["text"]
+        )
+    )
+
+
+_MAP_PROMPT_TEMPLATE = """
+        Write a concise summary of the following content:
+        Content:{text}
+        """
+
+
+@dataclass(slots=True, frozen=True)
 class SummarizerConfig:
     """Configuration class for the summarizer"""
 
-    def __init__(self, model_name: str = "Gemma-7b-It", max_words: int = 300):
-        self.model_name = model_name
-        self.max_words = max_words
-        self.prompt_template = f"""
-        Provide a summary of the following content in {max_words} words:
+    model_name: str = "Gemma-7b-It"
+    max_words: int = 300
+    chunk_size: int = 4000
+    batch_size: int = 3000
+
+    @property
+    def map_prompt_template(self) -> str:
+        """Prompt used to summarize each batch in the map step"""
+        return _MAP_PROMPT_TEMPLATE
+
+    @property
+    def prompt_template(self) -> str:
+        """Prompt used to combine the batch summaries"""
+        return f"""
+        Provide a summary of the following content in {self.max_words} words:
         Content:{{text}}
         """
 
-        
+
 class ContentSummarizer:
     """Main class for content summarization"""
 
+    __slots__ = ("config", "splitter", "_prompt_head", "_prompt_tail")
+
     def __init__(self, config: SummarizerConfig):
         self.config = config
-        self.loader_factory = DocumentLoaderFactory()
-        self.llm = None
-        self.prompt = PromptTemplate(
-            template=self.config.prompt_template,
-            input_variables=["text"]
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size = self.config.chunk_size,
+            chunk_overlap = 200
         )
+        # The combine prompt is fixed per config, so split it around {text} once
+        # and build the final prompt by concatenation instead of PromptTemplate.format
+        self._prompt_head, _, self._prompt_tail = self.config.prompt_template.partition("{text}")
 
-    def initialize_llm(self, groq_api_key : str) -> bool:
-        """Initialize the language model with API key"""
+    def initialize_llm(self, groq_api_key : str) -> tuple[Optional[LLMChain], str]:
+        """Return the map chain for the API key, or None and an error message
+
+        The chain is returned rather than stored because the summarizer is
+        shared by every session through get_summarizer.
+        """
         try:
-            self.llm = ChatGroq(
-                model = self.config.model_name,
-                groq_api_key = groq_api_key
+            map_chain = _build_map_chain(
+                self.config.model_name,
+                hashlib.sha256(groq_api_key.encode()).hexdigest(),
+                self.config.map_prompt_template,
+                groq_api_key
             )
-            return True
-        except Exception as e:
-            logging.error(f"Failed to initialized LLM: {e}")
-            return False
+            return map_chain, ""
+        except Exception:
+            error_id = _log_failure("Failed to initialize LLM")
+            return None, f"Failed to initialize language model (error ID: {error_id})"
         
     def validate_inputs(self, groq_api_key : str, url : str) -> tuple[bool, str]:
         """validate the input parameters"""
@@ -116,7 +315,7 @@ class ContentSummarizer:
         if not url.strip():
             return False, "Please provide a URL"
 
-        if not validators.url(url):
+        if not _validators().url(url):
             return False, "Please enter a valid URL. It can be a Youtube URL or a Website URL."
         
         return True, ""
@@ -124,59 +323,121 @@ class ContentSummarizer:
     def load_documents(self, url : str) -> tuple[Optional[List], str]:
         """Load documents from the given URL"""
         try:
-            loader = self.loader_factory.get_loader(url)
-            if not loader:
-                return None, "Unsupported URL format"
-            
-            documents = loader.load_documents(url)
+            documents = get_factory().get_loader(url).load_documents(url)
             return documents, ""
         
-        except Exception as e:
-            return None, f"Failed to load documents : {str(e)}"
+        except Exception:
+            error_id = _log_failure("Failed to load documents for %s", url)
+            return None, f"Failed to load documents (error ID: {error_id})"
         
 
-    def summarize_content(self, documents : List) -> tuple[Optional[str], str]:
-        """Summarize the loaded documents"""
+    def summarize_content(self, map_chain : Optional[LLMChain], documents : List) -> tuple[Optional[Iterator[str]], str]:
+        """Summarize the loaded documents, returning a stream of summary tokens"""
         try: 
-            if not self.llm:
+            if not map_chain:
                 return None, "Language model not initialized"
             
-            chain = load_summarize_chain(
-                self.llm,
-                chain_type = 'stuff',
-                prompt = self.prompt
+            batches = self._pack_texts(
+                [split.page_content for split in self.splitter.split_documents(documents)]
             )
-            summary = chain.run(documents)
-            return summary, ""
+            if len(batches) == 1:
+                # Content fits a single batch: stuff the original text (without the
+                # splitter's overlap) straight into the combine prompt
+                texts = [doc.page_content for doc in documents]
+                return self._stream_combine(map_chain, texts), ""
+
+            summaries = self._map_collapse(map_chain, batches)
+            return self._stream_combine(map_chain, summaries), ""
     
-        except Exception as e:
-            return None, f"Failed to generate summary: {str(e)}"
+        except Exception:
+            error_id = _log_failure("Failed to generate summary")
+            return None, f"Failed to generate summary (error ID: {error_id})"
+
+    def _pack_texts(self, texts : List[str]) -> List[str]:
+        """Greedily merge texts into batches of about batch_size tokens"""
+        batches = []
+        current, tokens = [], 0
+
+        for text in texts:
+            num_tokens = _estimate_tokens(text)
+            if current and tokens + num_tokens > self.config.batch_size:
+                batches.append("\n\n".join(current))
+                current, tokens = [], 0
+
+            current.append(text)
+            tokens += num_tokens
+
+        if current:
+            batches.append("\n\n".join(current))
+
+        return batches
+
+    def _map_collapse(self, map_chain : LLMChain, batches : List[str]) -> List[str]:
+        """Map the batches, then re-pack and re-map the summaries until they fit one prompt"""
+        summaries = self._map(map_chain, batches)
+
+        while len(summaries) > 1 and _estimate_tokens("\n\n".join(summaries)) > self.config.batch_size:
+            groups = self._pack_texts(summaries)
+            if len(groups) == len(summaries):
+                raise ValueError("Summaries are too long to combine within batch_size tokens")
+            summaries = self._map(map_chain, groups)
+
+        return summaries
+
+    def _map(self, map_chain : LLMChain, texts : List[str]) -> List[str]:
+        """Run the map calls concurrently and return the per-batch summaries
+
+        batch() fans the calls out over a thread pool with the sync client.
+        The cached ChatGroq's async client would be bound to the event loop
+        of whichever asyncio.run first used it.
+        """
+        results = map_chain.batch(
+            [{"text": text} for text in texts],
+            config={"max_concurrency": _MAX_CONCURRENT_MAP_CALLS}
+        )
+        return [result[map_chain.output_key] for result in results]
+
+    def _stream_combine(self, map_chain : LLMChain, texts : List[str]) -> Iterator[str]:
+        """Stream the combine prompt over the given texts token by token"""
+        prompt = self._prompt_head + "\n\n".join(texts) + self._prompt_tail
+        for chunk in map_chain.llm.stream(prompt):
+            yield chunk.content
         
-    def process_url(self, groq_api_key : str, url : str) -> tuple[Optional[str], str]:
-        """Main method to process URL and return summary"""
+    def process_url(self, groq_api_key : str, url : str) -> tuple[Optional[Iterator[str]], str]:
+        """Main method to process URL and return a stream of the summary"""
 
         is_valid, error_msg = self.validate_inputs(groq_api_key, url)
         if not is_valid:
             return None, error_msg
         
-        if not self.initialize_llm(groq_api_key):
-            return None, "Failed to initialize language model"
+        map_chain, error_msg = self.initialize_llm(groq_api_key)
+        if map_chain is None:
+            return None, error_msg
         
         documents, error_msg = self.load_documents(url)
-        return None, error_msg
-    
-        summary, error_msg = self.summarize_content(documents)
+        if documents is None:
+            return None, error_msg
+
+        summary, error_msg = self.summarize_content(map_chain, documents)
         if summary is None:
             return None, error_msg
         
         return summary, ""
     
 
+@st.cache_resource
+def get_summarizer(config: SummarizerConfig) -> ContentSummarizer:
+    """Return a summarizer shared across reruns for the given configuration"""
+    return ContentSummarizer(config)
+
+
 class StreamlitUI:
     """Class to handle Streamlit user interface"""
 
+    __slots__ = ("summarizer",)
+
     def __init__(self):
-        self.summarizer = ContentSummarizer(SummarizerConfig())
+        self.summarizer = get_summarizer(SummarizerConfig())
         self.setup_page_config()
 
 
@@ -215,15 +476,25 @@ class StreamlitUI:
     def handel_summarization(self, groq_api_key : str, url : str):
         """Handle the summarization process"""
         with st.spinner("Processing... Please wait while we analyze the content."):
-            summary, error_msg = self.summarizer.process_url(groq_api_key, url)
+            summary_stream, error_msg = self.summarizer.process_url(groq_api_key, url)
+
+        if summary_stream is None:
+            self.render_error(error_msg)
+            return
+
+        st.write("### Summary")
+        try:
+            st.write_stream(summary_stream)
+        except Exception:
+            error_id = _log_failure("Failed to stream summary")
+            self.render_error(f"Failed to generate summary (error ID: {error_id})")
+            return
 
-            if summary:
-                st.success("✅ Summary generated successfully!")
-                st.write("### Summary")
-                st.write(summary)
+        st.success("✅ Summary generated successfully!")
 
-            else:
-                st.error(f"❌ Error: {error_msg}")
+    def render_error(self, error_msg : str):
+        """Render an error message"""
+        st.error(f"❌ Error: {error_msg}")
 
     def run(self):
         """Main method to run the Streamlit application"""
@@ -241,9 +512,9 @@ def main():
         app = StreamlitUI()
         app.run()
 
-    except Exception as e:
-        st.error(f"Application error : {str(e)}")
-        logging.error(f"Application error : {e}")
+    except Exception:
+        error_id = _log_failure("Application error")
+        st.error(f"Application error (error ID: {error_id})")
 
 
 if __name__ == "__main__":